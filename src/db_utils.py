@@ -1,7 +1,32 @@
+import logging
 import os
-from sqlalchemy import Column, Date, Float, ForeignKey, Integer, String, Text, create_engine
-from sqlalchemy.orm import declarative_base, relationship, sessionmaker
-
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    create_engine,
+    func,
+    inspect,
+    text,
+)
+from sqlalchemy.dialects import mysql
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.schema import AddConstraint, CreateColumn, CreateIndex
+from sqlalchemy.orm import declarative_base, relationship, scoped_session, sessionmaker
+
+
+logger = logging.getLogger(__name__)
+
+# Microsecond timestamps, so two writes within the same second still move
+# MAX(updated_at) and with it the /api/wells ETag.
+UPDATED_AT_TYPE = DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql")
 
 Base = declarative_base()
 _engine = None
@@ -20,20 +45,90 @@ def _database_url() -> str:
 def _get_session_factory():
     global _engine, _SessionFactory
     if _engine is None:
-        _engine = create_engine(_database_url(), pool_pre_ping=True)
+        _engine = create_engine(
+            _database_url(),
+            pool_pre_ping=True,
+            pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "40")),
+            pool_recycle=3600,
+        )
         Base.metadata.create_all(_engine)
+        _add_missing_columns(_engine)
+        _add_missing_indexes(_engine)
     if _SessionFactory is None:
         _SessionFactory = sessionmaker(bind=_engine, autoflush=False, autocommit=False)
     return _SessionFactory
 
 
+def _add_missing_columns(engine) -> None:
+    """Add model columns that tables created by older versions of the models lack.
+
+    ``create_all`` only creates missing tables; it never alters existing ones.
+    Timestamp columns created before ``updated_at`` gained microseconds are
+    widened to the model's fractional-second precision as well.
+    """
+
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"]: column["type"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                definition = CreateColumn(column).compile(dialect=engine.dialect)
+                if column.name not in existing:
+                    connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {definition}"))
+                    continue
+                wanted = _fractional_seconds(column.type.dialect_impl(engine.dialect))
+                if wanted > _fractional_seconds(existing[column.name]):
+                    connection.execute(text(f"ALTER TABLE {table.name} MODIFY COLUMN {definition}"))
+
+
+def _fractional_seconds(column_type) -> int:
+    return getattr(column_type, "fsp", None) or 0
+
+
+def _add_missing_indexes(engine) -> None:
+    """Create named indexes and unique constraints that tables from older models lack.
+
+    The stimulation upsert relies on ``uq_stim_well_date``; without it MySQL
+    has no key to detect duplicates on and simply inserts another row.
+    """
+
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        existing = {constraint["name"] for constraint in inspector.get_unique_constraints(table.name)}
+        existing.update(index["name"] for index in inspector.get_indexes(table.name))
+        unique_constraints = [
+            constraint for constraint in table.constraints if isinstance(constraint, UniqueConstraint)
+        ]
+        for item in (*unique_constraints, *table.indexes):
+            if not item.name or item.name in existing:
+                continue
+            ddl = AddConstraint(item) if isinstance(item, UniqueConstraint) else CreateIndex(item)
+            try:
+                with engine.begin() as connection:
+                    connection.execute(ddl)
+            except DBAPIError as exc:
+                logger.warning(
+                    "Could not add %s to %s (unique keys need duplicate rows removed first): %s",
+                    item.name,
+                    table.name,
+                    exc.orig,
+                )
+
+
 def get_session():
     factory = _get_session_factory()
     return factory()
 
 
+# Thread-local session registry for the web app; call ``Session.remove()`` at
+# the end of each request.
+Session = scoped_session(get_session)
+
+
 class Well(Base):
     __tablename__ = "wells"
+    __table_args__ = (Index("ix_well_operator_name", "operator", "well_name"),)
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     operator = Column(String(255))
@@ -46,12 +141,14 @@ class Well(Base):
     latitude = Column(Float)
     longitude = Column(Float)
     datum = Column(String(255))
+    updated_at = Column(UPDATED_AT_TYPE, server_default=func.now(6), onupdate=func.now(6))
 
     stimulations = relationship("StimulationData", back_populates="well", cascade="all, delete-orphan")
 
 
 class StimulationData(Base):
     __tablename__ = "stimulation_data"
+    __table_args__ = (UniqueConstraint("well_id", "date_stimulated", name="uq_stim_well_date"),)
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     well_id = Column(Integer, ForeignKey("wells.id"), nullable=False)
@@ -68,5 +165,6 @@ class StimulationData(Base):
     max_treatment_pressure = Column(Float)
     max_treatment_rate = Column(Float)
     details = Column(Text)
+    updated_at = Column(UPDATED_AT_TYPE, server_default=func.now(6), onupdate=func.now(6))
 
     well = relationship("Well", back_populates="stimulations")
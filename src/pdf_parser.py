@@ -1,7 +1,7 @@
 """Utilities for extracting well and stimulation data from PDF files.
 
 The PDFs for the lab are a mixture of digitally generated documents and
-scanned images.  We first attempt to pull embedded text via PyPDF2 and fall
+scanned images.  We first attempt to pull embedded text via PyMuPDF and fall
 back to Tesseract OCR when needed.  The extracted text is then parsed with a
 set of relaxed regular expressions so that minor wording differences between
 documents do not break the pipeline.
@@ -14,18 +14,33 @@ database using the SQLAlchemy models defined in ``db_utils``.
 from __future__ import annotations
 
 import argparse
+import hashlib
 import html
 import logging
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
-from typing import Dict, Iterable, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-from PyPDF2 import PdfReader
-from pdf2image import convert_from_path
-from pdf2image.exceptions import PDFInfoNotInstalledError, PDFPageCountError
+import pymupdf
 import pytesseract
+from PIL import Image
+from sqlalchemy import func, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+try:  # Optional multi-pattern matcher; not available on every platform.
+    import hyperscan
+except ImportError:  # pragma: no cover - depends on the installed wheels
+    hyperscan = None
+
+try:  # Optional in-process Tesseract binding; keeps the model loaded across pages.
+    from tesserocr import PyTessBaseAPI
+except ImportError:  # pragma: no cover - depends on the installed wheels
+    PyTessBaseAPI = None
 
 if __package__ in (None, ""):
     import sys
@@ -39,10 +54,14 @@ else:  # pragma: no cover - executed when imported as package module
 logger = logging.getLogger(__name__)
 
 
-POPPLER_PATH = os.getenv("POPPLER_PATH")
 TESSERACT_CMD = os.getenv("TESSERACT_CMD")
 if TESSERACT_CMD:
     pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
+# 200 DPI holds up on typed reports at under half the pixels of 300 DPI; OEM 1
+# is the LSTM engine that the ``tessdata_fast`` models ship for.
+OCR_DPI = int(os.getenv("OCR_DPI", "200"))
+TESSERACT_OEM = int(os.getenv("TESSERACT_OEM", "1"))
+TESSERACT_PSM = int(os.getenv("TESSERACT_PSM", "6"))
 
 
 WELL_PATTERNS = {
@@ -94,85 +113,246 @@ STIM_PATTERNS = {
 }
 
 
-HTML_TAG_RE = re.compile(r"<[^>]+>")
-NON_PRINTABLE_RE = re.compile(r"[^\x09\x0A\x0D\x20-\x7E]")
+WELL_PATTERNS_C = {
+    key: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+    for key, patterns in WELL_PATTERNS.items()
+}
+STIM_PATTERNS_C = {
+    key: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+    for key, patterns in STIM_PATTERNS.items()
+}
+
+
+def label_prefix(pattern: str) -> str:
+    """Return the part of ``pattern`` that precedes its first capture group.
+
+    When the capture sits inside a non-capturing group, the prefix stops before
+    that enclosing group so it remains a valid expression on its own.
+    """
+
+    open_groups: List[int] = []
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\":
+            index += 2
+            continue
+        if char == "[":
+            # Skip the character class; a leading "]" or "^]" is literal.
+            index += 1
+            if pattern.startswith("^", index):
+                index += 1
+            if pattern.startswith("]", index):
+                index += 1
+            while index < len(pattern) and pattern[index] != "]":
+                index += 2 if pattern[index] == "\\" else 1
+        elif char == "(":
+            if not pattern.startswith("?", index + 1):
+                return pattern[: open_groups[0] if open_groups else index]
+            open_groups.append(index)
+        elif char == ")" and open_groups:
+            open_groups.pop()
+        index += 1
+    return pattern
+
+
+def build_hyperscan_database(patterns: Dict[str, List[re.Pattern]]):
+    """Compile the label of every field pattern into one Hyperscan database.
+
+    Only the text before each capture group is compiled.  A trailing ``(.+)``
+    would otherwise report a match at every offset up to the end of the line,
+    and each report is a Python callback.  Pattern ids follow the flattened
+    order of ``patterns``.  Returns ``None`` when Hyperscan is not installed
+    or rejects a pattern, in which case field extraction falls back to one
+    ``re`` search per pattern.
+    """
+
+    if hyperscan is None:
+        return None
+
+    compiled = [pattern for field_patterns in patterns.values() for pattern in field_patterns]
+    flags = []
+    for pattern in compiled:
+        pattern_flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST
+        pattern_flags |= hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP
+        if pattern.flags & re.DOTALL:
+            pattern_flags |= hyperscan.HS_FLAG_DOTALL
+        flags.append(pattern_flags)
+
+    database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+    try:
+        database.compile(
+            expressions=[(label_prefix(pattern.pattern) or pattern.pattern).encode("utf-8") for pattern in compiled],
+            ids=list(range(len(compiled))),
+            elements=len(compiled),
+            flags=flags,
+        )
+    except hyperscan.error as exc:
+        logger.warning("Hyperscan could not compile field patterns, using re instead: %s", exc)
+        return None
+    return database
+
+
+WELL_HYPERSCAN_DB = build_hyperscan_database(WELL_PATTERNS_C)
+STIM_HYPERSCAN_DB = build_hyperscan_database(STIM_PATTERNS_C)
+LAT_LONG_RE = re.compile(
+    r"Lat(?:itude)?[:#\s-]+(-?\d+\.\d+).{0,80}?Long(?:itude)?[:#\s-]+(-?\d+\.\d+)",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+class NonPrintableTable(dict):
+    """``str.translate`` table mapping everything outside printable ASCII to a space.
+
+    Latin-1 is filled in up front; other code points are classified on first
+    use and cached, so ``translate`` stays in C for repeated characters.
+    """
+
+    def __init__(self) -> None:
+        super().__init__((codepoint, self._classify(codepoint)) for codepoint in range(0x100))
+
+    @staticmethod
+    def _classify(codepoint: int) -> int:
+        return codepoint if 0x20 <= codepoint <= 0x7E else 0x20
+
+    def __missing__(self, codepoint: int) -> int:
+        value = self[codepoint] = self._classify(codepoint)
+        return value
+
+
+NON_PRINTABLE_TABLE = NonPrintableTable()
+TAG_OR_SPACE_RUN_RE = re.compile(r"(?:<[^>]+>|\s)+")
+# clean_string output is printable ASCII, so dropping every other printable
+# character leaves exactly [0-9A-Za-z-].
+API_DROP_TABLE = str.maketrans(
+    "", "", "".join(char for char in map(chr, range(0x20, 0x7F)) if not (char.isalnum() or char == "-"))
+)
+NON_DIGIT_RE = re.compile(r"\D")
+COMMA_STRIP_TABLE = str.maketrans("", "", ",")
+API_DIGIT_RUN_RE = re.compile(r"(?:\d[\s\-/\\]*){10,14}")
+API_CONTIGUOUS_RE = re.compile(r"\b\d{10,14}\b")
+# Thresholds for trusting the embedded text layer over OCR.
+MIN_TEXT_CHARS_PER_PAGE = 200
+MIN_TEXT_ALNUM_RATIO = 0.5
+TEXT_LAYER_PROBE_PAGES = 3
+# Part of the text cache key; bump when extraction output changes for the same settings.
+EXTRACTOR_VERSION = "2"
+UPSERT_BATCH_SIZE = 500
 STRING_MISSING_DEFAULT = "N/A"
 NUMERIC_MISSING_DEFAULT = 0
 
 
-def extract_text_from_pdf(pdf_path: Path, dpi: int = 300) -> str:
+def extract_text_from_pdf(pdf_path: Path, dpi: int = OCR_DPI) -> str:
     """Return textual content from a PDF file.
 
-    We first try to read the embedded text.  If the document is image-only we
-    fall back to OCR via ``pdf2image`` and ``pytesseract``.
+    We first try to read the embedded text.  If the document is image-only, or
+    its text layer looks like scanner noise, we render the pages in memory with
+    PyMuPDF and fall back to Tesseract OCR.
     """
 
-    text_chunks = []
     try:
-        reader = PdfReader(str(pdf_path))
-    except Exception as exc:  # pragma: no cover - defensive logging
-        logger.warning("Failed to open text layer for %s: %s", pdf_path, exc)
-        reader = None
+        document = pymupdf.open(pdf_path)
+    except Exception as exc:  # pragma: no cover - corrupt or unreadable PDFs
+        logger.error("Failed to open %s: %s", pdf_path, exc)
+        return ""
 
-    if reader is not None:
-        for page_number, page in enumerate(reader.pages, start=1):
+    with document:
+        text_chunks = []
+        for page_number, page in enumerate(document, start=1):
+            if page_number == TEXT_LAYER_PROBE_PAGES + 1:
+                # Scanned documents rarely gain a text layer part-way through, so
+                # stop walking pages when the first few hold less than one page
+                # worth of real text between them.
+                if not looks_born_digital("\n".join(text_chunks), 1):
+                    break
             try:
-                extracted = page.extract_text() or ""
+                extracted = page.get_text("text")
             except Exception as exc:  # pragma: no cover - per-page extraction failure
                 logger.debug(
-                    "extract_text failed for %s page %d: %s", pdf_path, page_number, exc
+                    "get_text failed for %s page %d: %s", pdf_path, page_number, exc
                 )
                 continue
             if extracted.strip():
                 text_chunks.append(extracted)
 
-    aggregated = "\n".join(text_chunks)
-    if aggregated.strip():
-        return aggregated
+        aggregated = "\n".join(text_chunks)
+        if looks_born_digital(aggregated, document.page_count):
+            return aggregated
+
+        logger.info("Falling back to OCR for %s", pdf_path)
+        # Keep whatever the text layer had if OCR is unavailable or fails.
+        return ocr_pdf(document, dpi) or aggregated
+
+
+def ocr_pdf(document: pymupdf.Document, dpi: int) -> str:
+    """OCR every page of an open document, rendering one page at a time."""
 
-    logger.info("Falling back to OCR for %s", pdf_path)
     try:
-        kwargs = {"dpi": dpi}
-        if POPPLER_PATH:
-            kwargs["poppler_path"] = POPPLER_PATH
-        images = convert_from_path(str(pdf_path), **kwargs)
-    except PDFInfoNotInstalledError:
-        logger.error(
-            "convert_from_path failed for %s: Poppler is required for OCR fallback. "
-            "Install it and set POPPLER_PATH if needed.",
-            pdf_path,
-        )
-        return ""
-    except PDFPageCountError as exc:  # pragma: no cover - corrupt PDFs
-        logger.error("convert_from_path failed for %s: %s", pdf_path, exc)
-        return ""
-    except Exception as exc:  # pragma: no cover - conversion errors
-        logger.error("convert_from_path failed for %s: %s", pdf_path, exc)
+        ocr_text = ocr_images(render_page(page, dpi) for page in document)
+    except Exception as exc:  # pragma: no cover - rendering or OCR dependency issues
+        logger.error("OCR failed for %s: %s", document.name, exc)
         return ""
 
-    ocr_text = []
-    for image in images:
-        try:
-            ocr_text.append(pytesseract.image_to_string(image))
-        except Exception as exc:  # pragma: no cover - OCR dependency issues
-            logger.error("Tesseract OCR failed for %s: %s", pdf_path, exc)
-            return ""
-
     return "\n".join(ocr_text)
 
 
+def render_page(page: pymupdf.Page, dpi: int) -> Image.Image:
+    """Rasterise a page straight into a grayscale PIL image without touching disk.
+
+    Tesseract binarises its input anyway, so a single gray channel loses
+    nothing and is a third of the size of an RGB render.
+    """
+
+    pixmap = page.get_pixmap(dpi=dpi, colorspace=pymupdf.csGRAY)
+    return Image.frombytes("L", (pixmap.width, pixmap.height), pixmap.samples)
+
+
+def looks_born_digital(text: str, page_count: int) -> bool:
+    """Return whether an embedded text layer is real content rather than noise.
+
+    Scanned PDFs often carry a few stray characters in their text layer, so an
+    empty check is not enough to decide whether OCR can be skipped.
+    """
+
+    characters = "".join(text.split())
+    if not characters:
+        return False
+    if len(characters) < MIN_TEXT_CHARS_PER_PAGE * max(page_count, 1):
+        return False
+    alphanumeric = sum(1 for char in characters if char.isalnum())
+    return alphanumeric / len(characters) >= MIN_TEXT_ALNUM_RATIO
+
+
+def ocr_images(images: Iterable[Image.Image]) -> List[str]:
+    """OCR page images, loading the Tesseract model only once per document.
+
+    ``pytesseract`` starts a fresh ``tesseract`` process (and reloads the
+    language model) for every image, so it is only used when ``tesserocr`` is
+    not installed.
+    """
+
+    if PyTessBaseAPI is None:
+        config = f"--oem {TESSERACT_OEM} --psm {TESSERACT_PSM}"
+        return [pytesseract.image_to_string(image, config=config) for image in images]
+
+    ocr_text = []
+    with PyTessBaseAPI(lang="eng", psm=TESSERACT_PSM, oem=TESSERACT_OEM) as api:
+        for image in images:
+            api.SetImage(image)
+            ocr_text.append(api.GetUTF8Text())
+    return ocr_text
+
+
 def parse_well_info(text: str) -> Dict[str, Optional[str]]:
     """Parse basic well metadata from extracted text."""
 
     lines_normalized = normalise_text(text)
-    data = {key: extract_first_match(lines_normalized, patterns) for key, patterns in WELL_PATTERNS.items()}
 
-    # Latitude / longitude often appear together on the same line.
-    lat_long_match = re.search(
-        r"Latitude[:#\s-]+(-?\d+\.\d+).{0,40}?Longitude[:#\s-]+(-?\d+\.\d+)",
-        lines_normalized,
-        flags=re.IGNORECASE | re.DOTALL,
-    )
+    # Latitude / longitude often appear together on the same line; when they
+    # do, the per-field coordinate patterns need not run at all.
+    lat_long_match = LAT_LONG_RE.search(lines_normalized)
+    skip = ("latitude", "longitude") if lat_long_match else ()
+    data = extract_first_matches(lines_normalized, WELL_PATTERNS_C, WELL_HYPERSCAN_DB, skip=skip)
     if lat_long_match:
         data["latitude"] = lat_long_match.group(1)
         data["longitude"] = lat_long_match.group(2)
@@ -200,7 +380,7 @@ def parse_stimulation_data(text: str) -> Dict[str, Optional[str]]:
     """Parse stimulation information from extracted text."""
 
     lines_normalized = normalise_text(text)
-    data = {key: extract_first_match(lines_normalized, patterns) for key, patterns in STIM_PATTERNS.items()}
+    data = extract_first_matches(lines_normalized, STIM_PATTERNS_C, STIM_HYPERSCAN_DB)
 
     details = extract_multiline_block(lines_normalized, "Details") or data.get("details")
 
@@ -221,8 +401,10 @@ def parse_stimulation_data(text: str) -> Dict[str, Optional[str]]:
     }
 
 
-def insert_data(session, well_data: Dict[str, Optional[str]], stim_data: Dict[str, Optional[str]], source_path: Path) -> None:
-    """Upsert the parsed data into the database."""
+def prepare_payloads(
+    well_data: Dict[str, Optional[str]], stim_data: Dict[str, Optional[str]], source_path: Path
+) -> Optional[Tuple[Dict[str, object], Dict[str, object]]]:
+    """Apply missing-value defaults; return ``None`` when no API number was parsed."""
 
     well_prepared = apply_missing_defaults(
         well_data,
@@ -233,18 +415,7 @@ def insert_data(session, well_data: Dict[str, Optional[str]], stim_data: Dict[st
     well_payload = {k: v for k, v in well_prepared.items() if v not in (None, "")}
     if not well_payload.get("api"):
         logger.warning("Skipping %s because no API number was parsed", source_path)
-        return
-
-    well = session.query(Well).filter(Well.api == well_payload["api"]).one_or_none()
-    if well is None:
-        well = Well(**well_payload)
-        session.add(well)
-        session.flush()
-        logger.info("Inserted new well %s from %s", well.api, source_path.name)
-    else:
-        for key, value in well_payload.items():
-            setattr(well, key, value)
-        logger.info("Updated existing well %s from %s", well.api, source_path.name)
+        return None
 
     stim_prepared = apply_missing_defaults(
         stim_data,
@@ -261,63 +432,277 @@ def insert_data(session, well_data: Dict[str, Optional[str]], stim_data: Dict[st
         exclude={"date_stimulated"},
     )
     stim_payload = {k: v for k, v in stim_prepared.items() if v not in (None, "")}
-    if stim_payload:
-        existing = None
-        if stim_payload.get("date_stimulated"):
-            existing = (
-                session.query(StimulationData)
-                .filter(
-                    StimulationData.well_id == well.id,
-                    StimulationData.date_stimulated == stim_payload["date_stimulated"],
-                )
-                .one_or_none()
-            )
-        if existing is None:
-            session.add(StimulationData(well=well, **stim_payload))
-        else:
-            for key, value in stim_payload.items():
-                setattr(existing, key, value)
+    # Multi-row INSERTs need the same columns in every row.
+    stim_payload.setdefault("date_stimulated", None)
+    return well_payload, stim_payload
+
+
+def insert_data(
+    session,
+    payloads: List[Tuple[Dict[str, object], Dict[str, object]]],
+    well_ids: Optional[Dict[str, int]] = None,
+) -> None:
+    """Upsert a batch of prepared payloads with one statement per table.
+
+    Wells are keyed on their unique ``api`` and stimulations on
+    ``(well_id, date_stimulated)``, so MySQL's ``INSERT ... ON DUPLICATE KEY
+    UPDATE`` replaces the per-file SELECT/INSERT/UPDATE round trips.  Rows
+    without a stimulation date never collide and are always inserted.
+
+    ``well_ids`` maps case-folded API numbers to well ids and is updated in
+    place; only APIs missing from it are looked up after the wells are
+    written.  Keys are case-folded because the column's case-insensitive
+    collation lets ``...O3911`` update a row stored as ``...o3911``.
+    """
+
+    if not payloads:
+        return
+
+    well_rows = [well for well, _ in payloads]
+    well_stmt = mysql_insert(Well).values(well_rows)
+    well_updates = {column: well_stmt.inserted[column] for column in well_rows[0] if column != "api"}
+    # Column.onupdate is not applied to ON DUPLICATE KEY UPDATE, so bump it here.
+    well_updates["updated_at"] = func.now(6)
+    session.execute(well_stmt.on_duplicate_key_update(well_updates))
+
+    if well_ids is None:
+        well_ids = {}
+    new_apis = {well["api"] for well in well_rows if well["api"].casefold() not in well_ids}
+    if new_apis:
+        rows = session.execute(select(Well.api, Well.id).where(Well.api.in_(new_apis)))
+        well_ids.update((api.casefold(), well_id) for api, well_id in rows)
+
+    stim_rows = [dict(stim, well_id=well_ids[well["api"].casefold()]) for well, stim in payloads]
+    stim_stmt = mysql_insert(StimulationData).values(stim_rows)
+    stim_updates = {
+        column: stim_stmt.inserted[column]
+        for column in stim_rows[0]
+        if column not in ("well_id", "date_stimulated")
+    }
+    stim_updates["updated_at"] = func.now(6)
+    session.execute(stim_stmt.on_duplicate_key_update(stim_updates))
 
     session.commit()
+    logger.info("Upserted %d wells with their stimulation data", len(payloads))
+
+
+def file_digest(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Return a content hash of ``path`` suitable for use as a cache key."""
+
+    digest = hashlib.blake2b(digest_size=20)
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def extraction_settings_key(dpi: int) -> str:
+    """Fingerprint everything besides the PDF bytes that shapes extracted text.
+
+    Bump ``EXTRACTOR_VERSION`` when the extraction code itself changes.
+    """
+
+    tessdata = Path(os.getenv("TESSDATA_PREFIX", "/usr/share/tesseract-ocr/5/tessdata"), "eng.traineddata")
+    try:
+        model = tessdata.stat()
+        model_stamp = (str(tessdata), model.st_size, model.st_mtime_ns)
+    except OSError:
+        model_stamp = (str(tessdata), None, None)
+    settings = (
+        EXTRACTOR_VERSION,
+        dpi,
+        TESSERACT_CMD,
+        TESSERACT_OEM,
+        TESSERACT_PSM,
+        model_stamp,
+        PyTessBaseAPI is not None,
+        MIN_TEXT_CHARS_PER_PAGE,
+        MIN_TEXT_ALNUM_RATIO,
+        TEXT_LAYER_PROBE_PAGES,
+        pymupdf.VersionBind,
+    )
+    return hashlib.blake2b(repr(settings).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def extract_text_cached(pdf_path: Path, cache_dir: Optional[Path], dpi: int = OCR_DPI) -> str:
+    """Return ``extract_text_from_pdf`` output, memoised on disk by file content.
+
+    Re-running the pipeline over the same folder then skips OCR for every PDF
+    whose bytes have not changed.  The key also covers the OCR and text-layer
+    settings, so changing any of them re-extracts.  Empty results are not
+    cached so that files which failed to extract are retried.
+    """
+
+    if cache_dir is None:
+        return extract_text_from_pdf(pdf_path, dpi)
+
+    try:
+        digest = file_digest(pdf_path)
+    except OSError as exc:  # broken symlinks and unreadable files from os.walk
+        logger.error("Failed to open %s: %s", pdf_path, exc)
+        return ""
+    cache_path = cache_dir / f"{digest}-{extraction_settings_key(dpi)}.txt"
+    try:
+        return cache_path.read_text(encoding="utf-8", errors="surrogatepass")
+    except FileNotFoundError:
+        pass
+
+    text = extract_text_from_pdf(pdf_path, dpi)
+    if text.strip():
+        # Write then rename so a concurrent worker never reads a partial file.
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            tmp_path.write_text(text, encoding="utf-8", errors="surrogatepass")
+            os.replace(tmp_path, cache_path)
+        except OSError as exc:
+            logger.warning("Could not cache extracted text for %s: %s", pdf_path, exc)
+    return text
 
 
-def process_pdf(session, pdf_path: Path) -> Tuple[Dict[str, Optional[str]], Dict[str, Optional[str]]]:
-    text = extract_text_from_pdf(pdf_path)
+def process_pdf(
+    pdf_path: Path, cache_dir: Optional[Path] = None
+) -> Tuple[Dict[str, Optional[str]], Dict[str, Optional[str]], Path]:
+    """Extract and parse one PDF without touching the database.
+
+    Runs inside worker processes, so it only returns plain data; persistence
+    happens in batches on the main process via ``insert_data``.
+    """
+
+    logger.info("Processing %s", pdf_path)
+    text = extract_text_cached(pdf_path, cache_dir)
     if not text.strip():
         logger.warning("%s produced no extractable text", pdf_path)
-        return {}, {}
+        return {}, {}, pdf_path
 
     well_data = parse_well_info(text)
     stim_data = parse_stimulation_data(text)
+    return well_data, stim_data, pdf_path
+
+
+def iter_pdf_files(folder: Path) -> Iterator[Path]:
+    """Yield PDFs below ``folder`` in a stable order.
+
+    ``os.walk`` classifies entries from ``scandir`` data, so unlike
+    ``rglob`` followed by ``is_file`` it does not stat every file again.
+    """
 
-    insert_data(session, well_data, stim_data, pdf_path)
-    return well_data, stim_data
+    for root, dirnames, filenames in os.walk(folder):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if filename.endswith(".pdf"):
+                yield Path(root, filename)
 
 
-def main(pdf_folder: str = "./pdfs") -> None:
+def configure_logging() -> None:
     logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
 
+
+def main(
+    pdf_folder: str = "./pdfs",
+    max_workers: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+    use_cache: bool = True,
+) -> None:
+    configure_logging()
+
     folder = Path(pdf_folder).expanduser().resolve()
     if not folder.exists():
         raise FileNotFoundError(f"PDF folder not found: {folder}")
 
-    pdf_files = sorted(p for p in folder.rglob("*.pdf") if p.is_file())
-    if not pdf_files:
+    text_cache: Optional[Path] = None
+    if use_cache:
+        text_cache = Path(cache_dir).expanduser().resolve() if cache_dir else folder / ".text_cache"
+        text_cache.mkdir(parents=True, exist_ok=True)
+
+    pdf_files = iter_pdf_files(folder)
+    first_pdf = next(pdf_files, None)
+    if first_pdf is None:
         logger.warning("No PDF files found in %s", folder)
         return
+    pdf_files = chain([first_pdf], pdf_files)
 
     session = get_session()
+    batch = []
+    well_ids: Dict[str, int] = {}
     try:
-        for pdf_path in pdf_files:
-            logger.info("Processing %s", pdf_path)
-            process_pdf(session, pdf_path)
+        # One query up front instead of an id lookup for every batch.
+        rows = session.execute(select(Well.api, Well.id).where(Well.api.is_not(None)))
+        well_ids.update((api.casefold(), well_id) for api, well_id in rows)
+        # OCR and regex parsing are CPU bound and independent per file, so they
+        # run in worker processes; the session stays on this process.
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count(), initializer=configure_logging) as executor:
+            futures = [(pdf_path, executor.submit(process_pdf, pdf_path, text_cache)) for pdf_path in pdf_files]
+            for pdf_path, future in futures:
+                try:
+                    well_data, stim_data, _ = future.result()
+                except Exception as exc:  # includes BrokenProcessPool after a native crash
+                    logger.error("Failed to process %s: %s", pdf_path, exc)
+                    continue
+                payloads = prepare_payloads(well_data, stim_data, pdf_path) if well_data else None
+                if payloads is None:
+                    continue
+                batch.append(payloads)
+                if len(batch) >= UPSERT_BATCH_SIZE:
+                    pending, batch = batch, []
+                    insert_data(session, pending, well_ids)
     finally:
-        session.close()
+        # Keep whatever was parsed before an interruption.
+        try:
+            insert_data(session, batch, well_ids)
+        finally:
+            session.close()
+
+
+def extract_first_matches(
+    text: str, patterns: Dict[str, List[re.Pattern]], database=None, skip: Iterable[str] = ()
+) -> Dict[str, Optional[str]]:
+    """Return the first captured value for every field in ``patterns``.
+
+    Each field uses its earliest-listed pattern that matches anywhere in
+    ``text``; later patterns are only tried when the earlier ones miss.  When a
+    Hyperscan ``database`` built from the same ``patterns`` is supplied, one
+    scan locates the leftmost label of every pattern and ``re`` only searches
+    from those offsets to pull out the capture group.  Fields listed in
+    ``skip`` are left as ``None`` without being searched.
+    """
+
+    skip = set(skip)
+    if database is None:
+        return {
+            key: None if key in skip else extract_first_match(text, field_patterns)
+            for key, field_patterns in patterns.items()
+        }
+
+    encoded = text.encode("utf-8", errors="replace")
+    starts: Dict[int, int] = {}
+
+    def on_match(pattern_id: int, start: int, end: int, flags: int, context) -> None:
+        if pattern_id not in starts or start < starts[pattern_id]:
+            starts[pattern_id] = start
+
+    database.scan(encoded, match_event_handler=on_match)
+
+    results: Dict[str, Optional[str]] = {}
+    pattern_id = 0
+    for key, field_patterns in patterns.items():
+        results[key] = None
+        for pattern in field_patterns:
+            start = starts.get(pattern_id)
+            pattern_id += 1
+            if start is None or results[key] is not None or key in skip:
+                continue
+            if len(encoded) != len(text):
+                start = len(encoded[:start].decode("utf-8", errors="ignore"))
+            # No full match can begin before the leftmost label match.
+            match = pattern.search(text, start)
+            if match and match.group(1):
+                results[key] = match.group(1).strip()
+    return results
 
 
-def extract_first_match(text: str, patterns: Iterable[str]) -> Optional[str]:
+def extract_first_match(text: str, patterns: Iterable[re.Pattern]) -> Optional[str]:
     for pattern in patterns:
-        match = re.search(pattern, text, flags=re.IGNORECASE)
+        match = pattern.search(text)
         if match and match.group(1):
             return match.group(1).strip()
     return None
@@ -332,17 +717,15 @@ def extract_multiline_block(text: str, label: str) -> Optional[str]:
 
 
 def normalise_text(text: str) -> str:
-    return re.sub(r"\r", "", text)
+    return text.replace("\r", "")
 
 
 def clean_string(value: Optional[str]) -> Optional[str]:
     if value is None:
         return None
-    unescaped = html.unescape(value)
-    without_tags = HTML_TAG_RE.sub(" ", unescaped)
-    without_controls = re.sub(r"[\r\n\t]+", " ", without_tags)
-    without_specials = NON_PRINTABLE_RE.sub(" ", without_controls)
-    cleaned = re.sub(r"\s+", " ", without_specials).strip()
+    printable = html.unescape(value).translate(NON_PRINTABLE_TABLE)
+    # Tags and whitespace runs (including mixes of both) become one space.
+    cleaned = TAG_OR_SPACE_RUN_RE.sub(" ", printable).strip()
     return cleaned or None
 
 
@@ -350,34 +733,47 @@ def normalise_api_string(value: Optional[str]) -> Optional[str]:
     cleaned = clean_string(value)
     if cleaned is None:
         return None
-    cleaned = cleaned.replace("–", "-").replace("—", "-")
-    cleaned = re.sub(r"\s+", "", cleaned)
-    cleaned = re.sub(r"[^0-9A-Za-z-]", "", cleaned)
+    cleaned = cleaned.translate(API_DROP_TABLE)
     return cleaned or None
 
 
 def safe_float(value: Optional[str]) -> Optional[float]:
-    if value is None:
+    if not value:
         return None
     try:
-        return float(value.replace(",", "").strip())
-    except Exception:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return float(value.translate(COMMA_STRIP_TABLE))
+    except ValueError:
         return None
 
 
 def safe_int(value: Optional[str]) -> Optional[int]:
-    if value is None:
+    number = safe_float(value)
+    if number is None:
         return None
     try:
-        return int(float(value.replace(",", "").strip()))
-    except Exception:
+        return int(number)
+    except (OverflowError, ValueError):
         return None
 
 
 def safe_date(value: Optional[str]) -> Optional[datetime.date]:
     if value is None:
         return None
-    value = value.strip()
+    return parse_date(value.strip())
+
+
+@lru_cache(maxsize=1024)
+def parse_date(value: str) -> Optional[datetime.date]:
+    """Parse a date in one of the report formats.
+
+    Cached because the same stimulation dates recur across an operator's
+    reports.
+    """
+
     for fmt in ("%m/%d/%Y", "%m/%d/%y", "%Y-%m-%d"):
         try:
             return datetime.strptime(value, fmt).date()
@@ -436,28 +832,20 @@ def extract_api_fallback(text: str) -> Optional[str]:
         return None
 
     normalised = text.replace("\u2013", "-").replace("\u2014", "-")
-    pattern = re.compile(r"(?:\d[\s\-/\\]*){10,14}")
-
     candidates = []
-    for match in pattern.finditer(normalised):
-        digits = re.sub(r"\D", "", match.group(0))
+    for match in API_DIGIT_RUN_RE.finditer(normalised):
+        digits = NON_DIGIT_RE.sub("", match.group(0))
         if 10 <= len(digits) <= 14:
             candidates.append(digits)
 
-    contiguous = re.findall(r"\b\d{10,14}\b", normalised)
+    contiguous = API_CONTIGUOUS_RE.findall(normalised)
     candidates.extend(contiguous)
 
     if not candidates:
         return None
 
     # Deduplicate while preserving first occurrence order then prefer longer matches.
-    seen = []
-    ordered = []
-    for value in candidates:
-        if value not in seen:
-            seen.append(value)
-            ordered.append(value)
-    ordered.sort(key=len, reverse=True)
+    ordered = sorted(dict.fromkeys(candidates), key=len, reverse=True)
     for digits in ordered:
         formatted = format_api(digits)
         if formatted:
@@ -469,5 +857,12 @@ def extract_api_fallback(text: str) -> Optional[str]:
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Parse well PDFs and populate the database")
     parser.add_argument("pdf_folder", nargs="?", default="./pdfs", help="Folder containing PDF files")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Worker processes for OCR/parsing (defaults to CPU count)"
+    )
+    parser.add_argument(
+        "--cache-dir", default=None, help="Where to cache extracted text (defaults to <pdf_folder>/.text_cache)"
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Always re-extract text, ignoring the cache")
     args = parser.parse_args()
-    main(args.pdf_folder)
+    main(args.pdf_folder, max_workers=args.workers, cache_dir=args.cache_dir, use_cache=not args.no_cache)
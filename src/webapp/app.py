@@ -1,14 +1,44 @@
+import hashlib
 import os
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional
 
-from flask import Flask, jsonify, abort
+import orjson
+from flask import Flask, Response, abort, request
+from sqlalchemy import func, select
+from sqlalchemy.orm import selectinload
 
-from src.db_utils import Well, StimulationData, get_session  # type: ignore
+from src.db_utils import Session, Well, StimulationData  # type: ignore
+
+
+# Wells serialised per chunk when streaming the full list.
+WELLS_PER_CHUNK = 100
 
 
 def create_app() -> Flask:
     app = Flask(__name__)
 
+    @app.teardown_appcontext
+    def _remove_session(exception: Optional[BaseException] = None) -> None:
+        Session.remove()
+
+    def _json_response(payload: object) -> Response:
+        return app.response_class(orjson.dumps(payload), mimetype="application/json")
+
+    def _stream_json_array(items: Iterator[Dict[str, object]]) -> Iterator[bytes]:
+        """Yield a JSON array a chunk at a time instead of one large document."""
+
+        yield b"["
+        separator = b""
+        chunk: List[bytes] = []
+        for item in items:
+            chunk.append(orjson.dumps(item))
+            if len(chunk) == WELLS_PER_CHUNK:
+                yield separator + b",".join(chunk)
+                chunk, separator = [], b","
+        if chunk:
+            yield separator + b",".join(chunk)
+        yield b"]"
+
     def _stimulation_to_dict(stim: StimulationData) -> Dict[str, object]:
         return {
             "id": stim.id,
@@ -49,30 +79,52 @@ def create_app() -> Flask:
     def health() -> Dict[str, str]:
         return {"status": "ok"}
 
+    def _wells_etag() -> str:
+        """Fingerprint the well list from row counts and last-modified times.
+
+        Counts catch deletions, which do not move ``MAX(updated_at)``.
+        """
+
+        stamp = Session.execute(
+            select(
+                func.count(Well.id),
+                func.max(Well.updated_at),
+                select(func.count(StimulationData.id)).scalar_subquery(),
+                select(func.max(StimulationData.updated_at)).scalar_subquery(),
+            )
+        ).one()
+        return hashlib.md5(repr(tuple(stamp)).encode()).hexdigest()
+
     @app.route("/api/wells", methods=["GET"])
     def list_wells():
-        session = get_session()
-        try:
-            wells: List[Well] = (
-                session.query(Well)
-                .order_by(Well.operator.asc(), Well.well_name.asc())
-                .all()
-            )
-            data = [_well_to_dict(well) for well in wells]
-            return jsonify(data)
-        finally:
-            session.close()
+        etag = _wells_etag()
+        if request.if_none_match.contains(etag):
+            not_modified = app.response_class(status=304)
+            not_modified.set_etag(etag)
+            return not_modified
+
+        wells: List[Well] = (
+            Session.query(Well)
+            .options(selectinload(Well.stimulations))
+            .order_by(Well.operator.asc(), Well.well_name.asc())
+            .all()
+        )
+
+        # Stimulations are loaded up front, so the wells can still be
+        # serialised after the request's session is removed.
+        body = _stream_json_array(_well_to_dict(well) for well in wells)
+        response = app.response_class(body, mimetype="application/json")
+        response.set_etag(etag)
+        # Let clients keep the list but revalidate it with If-None-Match.
+        response.cache_control.no_cache = True
+        return response
 
     @app.route("/api/wells/<string:api>", methods=["GET"])
     def get_well(api: str):
-        session = get_session()
-        try:
-            well: Well | None = session.query(Well).filter(Well.api == api).one_or_none()
-            if well is None:
-                abort(404, description=f"Well with API {api} not found")
-            return jsonify(_well_to_dict(well))
-        finally:
-            session.close()
+        well: Well | None = Session.query(Well).filter(Well.api == api).one_or_none()
+        if well is None:
+            abort(404, description=f"Well with API {api} not found")
+        return _json_response(_well_to_dict(well))
 
     return app
 